@@ -4,13 +4,22 @@ Scout for accepting input as CAS number or element name and perfrom strict valid
 
 import os
 import re
+import uuid
+import weakref
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from datetime import datetime
+from typing import Optional
+from urllib.parse import (urljoin, urlparse, urlsplit, urlunsplit, parse_qsl,
+                          urlencode)
 import fitz  # PyMuPDF
-import requests
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
 from googlesearch import search
 import aiohttp
-import json
+import aiofiles
+import orjson
 
 # Directories setup
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -21,6 +30,10 @@ os.makedirs(PDFS_FOLDER, exist_ok=True)
 os.makedirs(TEMP_FOLDER, exist_ok=True)
 os.makedirs(LOGS_FOLDER, exist_ok=True)
 
+# Append-only log of report entries, one JSON object per line
+REPORTS_LOG = os.path.join(LOGS_FOLDER, "reports.jsonl")
+REPORTS_LOG_FILE = open(REPORTS_LOG, "ab", buffering=0)
+
 # List of URLs to skip
 SKIP_URLS = set([
     "guidechem",
@@ -161,85 +174,223 @@ SKIP_URLS = set([
     "scribd",
 ])
 
-# URL visit count dictionary
-URL_VISIT_COUNT = {}
-DOMAIN_VISIT_COUNT = {}
-MAX_URL_VISITS = 5
+# Split the URLs to skip into hostnames and keywords
+SKIP_DOMAINS = {skip_url for skip_url in SKIP_URLS if "." in skip_url}
+SKIP_PATH_KWS = SKIP_URLS - SKIP_DOMAINS
+# Single pattern matching any of the keywords in one scan
+SKIP_RE = re.compile("|".join(map(re.escape, sorted(SKIP_PATH_KWS))))
+
+# Domain visit limit
 MAX_DOMAIN_VISITS = 5
 
 # Limit for downloading files
 DOWNLOAD_LIMIT = 5
-DOWNLOADED_FILES_COUNT = 0
+# Concurrent downloads across all scout calls, kept well below the number
+# of crawl workers so that most workers keep crawling while others wait
+DOWNLOAD_CONCURRENCY = 3
+
+# Limits for streaming downloads to disk
+MAX_PDF_SIZE = 20 * 1024 * 1024  # 20 MB
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+
+# Limit for concurrent requests while crawling
+CONCURRENCY_LIMIT = 10
+
+# Pattern for the phrase "safety data sheet"
+SDS_RE = re.compile(r'\bsafety\s+data\s+sheet\b', re.IGNORECASE)
+
+# Only <a href> tags are parsed from scraped pages
+ANCHORS_ONLY = SoupStrainer("a", href=True)
+
+# PyMuPDF is not thread safe, all PDF work runs on this single thread
+PDF_EXECUTOR = ThreadPoolExecutor(max_workers=1, thread_name_prefix="pdf")
+
+# Cached URL parsing, the same links recur across pages of a crawl
+parse_url = functools.lru_cache(maxsize=4096)(urlparse)
+
+# Cache of is_pdf results keyed by canonical URL
+IS_PDF_CACHE = {}
+IS_PDF_CACHE_SIZE = 4096
+
+
+# Download semaphore shared by all scout calls, per event loop
+DOWNLOAD_SEMAPHORES = weakref.WeakKeyDictionary()
+
 
+# Get download semaphore
+def get_download_semaphore():
+    """
+    Get the download semaphore of the running event loop, creating it on first use.
+
+    Returns:
+        asyncio.Semaphore: The semaphore limiting downloads to DOWNLOAD_CONCURRENCY.
+    """
+    loop = asyncio.get_running_loop()
+    if loop not in DOWNLOAD_SEMAPHORES:
+        DOWNLOAD_SEMAPHORES[loop] = asyncio.Semaphore(DOWNLOAD_CONCURRENCY)
+    return DOWNLOAD_SEMAPHORES[loop]
+
+
+# Crawl state
+@dataclass
+class CrawlCtx:
+    """
+    State of a single crawl, carried with every queued URL to find_pdfs and download_pdf.
 
-# Save report to JSON file
+    Each search result of a scout call gets its own context, so
+    domain_visit_count and downloaded_files_count are counted per search result.
+    report_list, report_queue and seen_urls are the same objects in every
+    context of one scout call, and are never shared between scout calls.
+    download_semaphore is shared by every scout call of the process.
+    """
+    report_list: list
+    report_queue: asyncio.Queue
+    download_semaphore: asyncio.Semaphore
+    target_pattern: re.Pattern
+    cas: Optional[str] = None
+    name: Optional[str] = None
+    name_tokens_pattern: Optional[re.Pattern] = None
+    seen_urls: set = field(default_factory=set)
+    domain_visit_count: dict = field(default_factory=dict)
+    max_domain_visits: int = MAX_DOMAIN_VISITS
+    download_limit: int = DOWNLOAD_LIMIT
+    downloaded_files_count: int = 0
+
+
+# Return report of a scout call
 def save_report(report_list):
     """
-    Save the global report list to a JSON file in the logs directory.
+    Return the report list of a scout call.
 
     The report includes details of each processed file such as the CAS number or name,
-    filename, download status, and provider.
+    filename, download status, and provider. The entries are already appended to
+    the reports log by report_writer as they are added.
     """
     if report_list:
-        try:
-            json_string = json.dumps(report_list, indent=4)
-            report_filename = datetime.now().strftime(
-                "%Y-%m-%d_%H-%M-%S") + ".json"
-            report_filename = os.path.join(LOGS_FOLDER, report_filename)
-            with open(report_filename, "w") as report_file:
-                report_file.write(json_string)
-            print(f"Scout report generated, check {report_filename}")
-            return json.loads(json_string)
-        except Exception as e:
-            print(f"An error occurred while generating the report: {e}")
-    else:
-        print("NO REPORT GENERATED")
+        print(f"Scout report generated, check {REPORTS_LOG}")
+        return report_list
 
+    print("NO REPORT GENERATED")
     return {}
 
 
 # Add report entry
-def add_report(report_list, cas, name, filepath, verified, provider, url):
+def add_report(ctx, filepath, verified, provider, url):
     """
-    Add an entry to the global report list.
+    Add an entry to the report list of a crawl and queue it for the reports log.
 
     Params:
-        cas_or_name (str): The CAS number or element name.
-        filename (str): The name of the file.
-        downloaded (bool): Whether the file was successfully downloaded.
+        ctx (CrawlCtx): The state of the crawl, holding the CAS number and name.
+        filepath (str): The path of the file.
+        verified (bool): Whether the file was verified as the required MSDS.
         provider (str): The provider or source of the file.
         url (str) : The url from which the pdf is downloaded.
     """
     report = {
-        "cas": cas,
-        "name": name,
+        "cas": ctx.cas,
+        "name": ctx.name,
         "provider": provider,
         "verified": verified,
         "filepath": filepath,
         "url": url
     }
-    report_list.append(report)
+    ctx.report_list.append(report)
+    ctx.report_queue.put_nowait(report)
+
+
+# Write report entries to the log
+async def report_writer(report_queue):
+    """
+    Append report entries from a queue to the reports log until None is received.
+
+    Params:
+        report_queue (asyncio.Queue): The queue of report entries.
+    """
+    while True:
+        report = await report_queue.get()
+        if report is None:
+            break
+        try:
+            entry = {
+                "timestamp": datetime.now().isoformat(timespec="seconds"),
+                **report
+            }
+            REPORTS_LOG_FILE.write(orjson.dumps(entry) + b"\n")
+        except Exception as e:
+            print(f"An error occurred while logging the report: {e}")
+
+
+# Canonicalize URL
+def canonical_url(url):
+    """
+    Build a canonical form of a URL so that equivalent URLs compare equal.
+
+    The scheme and host are lowercased, the fragment and trailing slash are
+    dropped and the query parameters are sorted.
+
+    Params:
+        url (str): The URL to canonicalize.
+
+    Returns:
+        str: The canonical URL.
+    """
+    parts = urlsplit(url)
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(),
+                       parts.path.rstrip("/"), query, ""))
+
+
+# Check if content type is PDF
+def is_pdf_content_type(content_type):
+    """
+    Check if a Content-Type header value is PDF, ignoring its parameters.
+
+    Params:
+        content_type (str): The Content-Type header value, may be None.
+
+    Returns:
+        bool: True if the media type is application/pdf, False otherwise.
+    """
+    media_type = (content_type or "").split(";")[0].strip().lower()
+    return media_type == "application/pdf"
 
 
 # Check if URL is a PDF
-def is_pdf(url):
+async def is_pdf(session, url):
     """
     Check if a URL points to a PDF file.
 
     Params:
+        session (aiohttp.ClientSession): The session used for the request.
         url (str): The URL to check.
 
     Returns:
         bool: True if the URL points to a PDF file, False otherwise.
     """
     try:
-        if url.endswith(".pdf"):
+        # Only send a HEAD request when the path does not already say PDF
+        if parse_url(url).path.lower().endswith(".pdf"):
             return True
 
-        response = requests.head(url, timeout=10)
-        content_type = response.headers.get("content-type")
-        return content_type == "application/pdf"
-    except requests.Timeout:
+        key = canonical_url(url)
+        if key in IS_PDF_CACHE:
+            return IS_PDF_CACHE[key]
+
+        timeout = aiohttp.ClientTimeout(total=10)
+        async with session.head(url, allow_redirects=True,
+                                timeout=timeout) as response:
+            # Do not cache failed checks, the error may be transient
+            if not response.ok:
+                return False
+            result = is_pdf_content_type(
+                response.headers.get("content-type"))
+
+        # Evict the oldest entry once the cache is full
+        if len(IS_PDF_CACHE) >= IS_PDF_CACHE_SIZE:
+            IS_PDF_CACHE.pop(next(iter(IS_PDF_CACHE)))
+        IS_PDF_CACHE[key] = result
+        return result
+    except asyncio.TimeoutError:
         print(f"Timeout occurred while checking {url}")
         return False
     except Exception as e:
@@ -247,65 +398,125 @@ def is_pdf(url):
         return False
 
 
-# Download PDF from URL
-async def download_pdf(session, url):
+# Check if URL should be skipped
+def is_skipped(parsed_url):
+    """
+    Check if a parsed URL belongs to a skipped domain or contains a skipped keyword.
+
+    Params:
+        parsed_url (urllib.parse.ParseResult): The parsed URL to check.
+
+    Returns:
+        bool: True if the URL should be skipped, False otherwise.
+    """
+    host = parsed_url.hostname or ""
+    labels = host.split(".")
+    # exact domain or any of its subdomains
+    for i in range(len(labels) - 1):
+        if ".".join(labels[i:]) in SKIP_DOMAINS:
+            return True
+    return SKIP_RE.search(host + parsed_url.path.lower()) is not None
+
+
+# Fetch PDF from URL
+async def fetch_pdf(session, url):
     """
     Download a PDF file from a URL and save it to the specified folder.
 
     Params:
         url (str): The URL of the PDF file.
-        folder_path (str): The folder path to save the PDF file.
 
     Returns:
         str: The file path of the downloaded PDF, or None if the download failed.
     """
-    global DOWNLOADED_FILES_COUNT
+    file_path = None
     try:
         async with session.get(url, timeout=10) as response:
             response.raise_for_status()
-            if response.headers.get('content-type') == 'application/pdf':
+            if is_pdf_content_type(response.headers.get('content-type')):
+                if (response.content_length or 0) > MAX_PDF_SIZE:
+                    print(f"Skipping {url}, file exceeds {MAX_PDF_SIZE} bytes.")
+                    return None
                 file_name = url.split("/")[-1]
-                if not file_name.endswith(".pdf"):
-                    file_name += ".pdf"
+                if file_name.endswith(".pdf"):
+                    file_name = file_name[:-len(".pdf")]
+                # Concurrent downloads may share a basename, keep names unique
+                file_name = f"{file_name}_{uuid.uuid4().hex[:8]}.pdf"
                 file_path = os.path.join(TEMP_FOLDER, file_name)
-                with open(file_path, 'wb') as pdf_file:
-                    pdf_file.write(await response.read())
+                # Stream to disk instead of holding the whole file in memory
+                size = 0
+                async with aiofiles.open(file_path, 'wb') as pdf_file:
+                    async for chunk in response.content.iter_chunked(
+                            DOWNLOAD_CHUNK_SIZE):
+                        size += len(chunk)
+                        if size > MAX_PDF_SIZE:
+                            break
+                        await pdf_file.write(chunk)
+                if size > MAX_PDF_SIZE:
+                    os.remove(file_path)
+                    print(f"Skipping {url}, file exceeds {MAX_PDF_SIZE} bytes.")
+                    return None
                 print(f"Downloaded: {file_name}")
-                DOWNLOADED_FILES_COUNT += 1
                 return file_path
             else:
                 print(f"Skipping {url}, not a PDF file.")
                 return None
     except Exception as e:
         print(f"An error occurred while downloading {url}: {e}")
+        # Delete the partially written file
+        if file_path and os.path.exists(file_path):
+            os.remove(file_path)
     return None
 
 
-# Extract text from PDF
-def extract_text_from_pdf(pdf_path):
+# Download PDF from URL
+async def download_pdf(session, url, ctx):
+    """
+    Download a PDF file within the download limits of a crawl.
+
+    Params:
+        url (str): The URL of the PDF file.
+        ctx (CrawlCtx): The state of the crawl the download belongs to.
+
+    Returns:
+        str: The file path of the downloaded PDF, or None if the download failed or the limit is reached.
+    """
+    # Reserve a slot before downloading, there is no await between the check
+    # and the increment so concurrent workers cannot overshoot the limit
+    if ctx.downloaded_files_count >= ctx.download_limit:
+        print(f"Skipping {url}, download limit reached.")
+        return None
+    ctx.downloaded_files_count += 1
+
+    # The worker waits here without crawling, the remaining workers go on
+    async with ctx.download_semaphore:
+        file_path = await fetch_pdf(session, url)
+    if file_path is None:
+        # Give the slot back, nothing was downloaded
+        ctx.downloaded_files_count -= 1
+    return file_path
+
+
+# Extract text from PDF page by page
+def extract_pages_from_pdf(pdf_path, max_pages=5):
     """
-    Extract text content from a PDF file.
+    Extract text content from a PDF file one page at a time.
 
     Params:
         pdf_path (str): The file path of the PDF.
+        max_pages (int, optional): The number of leading pages to read. Defaults to 5.
 
-    Returns:
-        str: The extracted text content, or None if extraction failed.
+    Yields:
+        str: The text content of each page, nothing if extraction failed.
     """
     try:
-        pageno = 1
-        doc = fitz.open(pdf_path)
-        text = ""
-        for page in doc:
-            if pageno > 5:  # read only first 5 pages
-                break
-            text += page.get_text()
-            pageno += 1
-        doc.close()
-        return text
+        with fitz.open(pdf_path) as doc:
+            for pageno, page in enumerate(doc):
+                if pageno >= max_pages:  # read only first pages
+                    break
+                yield page.get_text()
     except Exception as e:
         print(f"An error occurred while extracting text from {pdf_path}: {e}")
-        return None
 
 
 # Set regular expression pattern
@@ -324,29 +535,29 @@ def set_pattern(sequence):
 
 
 # Verify PDF content
-def verify_pdf(file_path, cas=None, name=None):
+def verify_pdf(file_path, target_pattern, name_tokens_pattern=None):
     """
     Verify if a PDF file contains the specified CAS number or element name and the phrase "safety data sheet".
 
     Params:
         file_path (str): The file path of the PDF.
-        cas_or_name (str): The CAS number or element name to verify against.
+        target_pattern (re.Pattern): The compiled pattern of the CAS number or element name.
+        name_tokens_pattern (re.Pattern, optional): The compiled pattern of the words of the element name. Defaults to None.
 
     Returns:
         bool: True if both patterns are found in the PDF content, False otherwise.
     """
-    text = extract_text_from_pdf(file_path)
-    if text is None:
-        return False
-    pattern1 = set_pattern(cas or name)
-    pattern2 = set_pattern("safety data sheet")
-    if name is not None:
-        pattern3 = re.compile('|'.join(map(re.escape, name.split())),
-                              re.IGNORECASE)
-    # exact match
-    if pattern1.search(text) and pattern2.search(text):
-        return "same"
-    elif name is not None and pattern2.search(text) and pattern3.search(text):
+    found_target = found_sds = found_tokens = False
+    for text in extract_pages_from_pdf(file_path):
+        found_target = found_target or target_pattern.search(text) is not None
+        found_sds = found_sds or SDS_RE.search(text) is not None
+        # exact match, stop reading further pages
+        if found_target and found_sds:
+            return "same"
+        if name_tokens_pattern is not None and not found_tokens:
+            found_tokens = name_tokens_pattern.search(text) is not None
+
+    if found_sds and found_tokens:
         return "similar"
 
     return False
@@ -368,16 +579,13 @@ def rename_and_move_file(file_path, destination, cas, name, provider):
         str: The new file name, or None if the operation failed.
     """
     try:
-        # Generate a unique file name
-        file_name = f"{cas or name}_{provider}.pdf"
-        counter = 1
-        while os.path.exists(os.path.join(destination, file_name)):
-            file_name = f"{cas or name}_{provider}_{counter}.pdf"
-            counter += 1
+        # Generate a unique file name without probing the destination
+        suffix = uuid.uuid4().hex[:8]
+        file_name = f"{cas or name}_{provider}_{suffix}.pdf"
 
         # Move the file
         new_location = os.path.join(destination, file_name)
-        os.rename(file_path, new_location)
+        os.replace(file_path, new_location)
         return new_location
     except Exception as e:
         print(
@@ -397,130 +605,136 @@ async def scrape_urls(session, url, base_url, timeout=10):
         timeout (int, optional): The timeout for the request in seconds. Defaults to 10.
 
     Returns:
-        list: A list of scraped URLs.
+        list: A list of unique scraped URLs, without fragments or skipped URLs.
     """
     try:
         async with session.get(url, timeout=timeout) as response:
             response.raise_for_status()
-            soup = BeautifulSoup(await response.text(), "html.parser")
-            links = [
-                urljoin(base_url, link['href'])
-                for link in soup.find_all("a", href=True)
-            ]
-            return links
+            soup = BeautifulSoup(await response.text(),
+                                 "lxml",
+                                 parse_only=ANCHORS_ONLY)
+            # dict keeps the page order while dropping duplicates
+            links = dict.fromkeys(
+                urljoin(base_url, link['href']).split("#", 1)[0]
+                for link in soup.find_all("a", href=True))
+            return [link for link in links if not is_skipped(parse_url(link))]
     except Exception as e:
         print(f"An error occurred while scraping links from {url}: {e}")
     return []
 
 
-# Find PDFs recursively
-async def find_pdfs(session,
-                    url,
-                    depth=2,
-                    base_url=None,
-                    cas=None,
-                    name=None,
-                    config_params={}):
+# Find PDFs from a single URL
+async def find_pdfs(session, queue, url, ctx, depth=2, base_url=None):
     """
-    Recursively find PDFs from a URL, download and verify them.
+    Download and verify a URL if it is a PDF, otherwise queue the links found on it.
 
     Params:
-        url (str): The URL to start searching from.
-        depth (int, optional): The depth of recursion. Defaults to 2.
+        queue (asyncio.Queue): The crawl frontier of (url, ctx, depth, base_url) items.
+        url (str): The URL to process.
+        ctx (CrawlCtx): The state of the crawl.
+        depth (int, optional): The remaining crawl depth. Defaults to 2.
         base_url (str, optional): The base URL for resolving relative links. Defaults to None.
-        cas_or_name (str, optional): The CAS number or element name for verification. Defaults to None.
     """
 
-    # extract params
-    DOWNLOADED_FILES_COUNT = config_params.get("DOWNLODED_FILES_COUNT", 0)
-    DOWNLOAD_LIMIT = config_params.get("download_limit", 0)
-    URL_VISIT_COUNT = config_params.get("url_visit_count", {})
-    DOMAIN_VISIT_COUNT = config_params.get("domain_visit_count", {})
-    MAX_URL_VISITS = config_params.get("max_url_visits", 0)
-    MAX_DOMAIN_VISITS = config_params.get("max_domain_visits", 0)
-    REPORT_LIST = config_params.get("report_list", [])
-
     # Depth check and stop when limit exceeded
-    if depth <= 0 or DOWNLOADED_FILES_COUNT >= DOWNLOAD_LIMIT:
+    if depth <= 0 or ctx.downloaded_files_count >= ctx.download_limit:
         return
-    if any(skip_url in url.lower() for skip_url in SKIP_URLS):
+    parsed_url = parse_url(url)
+    if is_skipped(parsed_url):
         print(f"Skipped: {url}")
         return
 
+    # Skip URLs equivalent to one already crawled, each URL is visited once
+    canonical = canonical_url(url)
+    if canonical in ctx.seen_urls:
+        return
+
     # Parse the domain from the URL
-    domain = urlparse(url).netloc
+    domain = parsed_url.netloc
 
     # Check if the domain visit count exceeds the limit
-    if DOMAIN_VISIT_COUNT.get(domain, 0) >= MAX_DOMAIN_VISITS:
+    if ctx.domain_visit_count.get(domain, 0) >= ctx.max_domain_visits:
         print(
-            f"Skipped: {url}, domain {domain} visited more than {MAX_DOMAIN_VISITS} times"
+            f"Skipped: {url}, domain {domain} visited more than {ctx.max_domain_visits} times"
         )
         return
 
-    # Check if the specific URL visit count exceeds the limit
-    if URL_VISIT_COUNT.get(url, 0) >= MAX_URL_VISITS:
-        print(f"Skipped: {url}, URL visited more than {MAX_URL_VISITS} times")
-        return
-
-    # Update visit counts
-    URL_VISIT_COUNT[url] = URL_VISIT_COUNT.get(url, 0) + 1
-    DOMAIN_VISIT_COUNT[domain] = DOMAIN_VISIT_COUNT.get(domain, 0) + 1
+    # Mark the URL as visited only once it passed this crawl's limits
+    ctx.seen_urls.add(canonical)
+    ctx.domain_visit_count[domain] = ctx.domain_visit_count.get(domain, 0) + 1
 
     # Use base_url if provided, otherwise infer from the URL itself
-    if not base_url:
-        base_url = f"{urlparse(url).scheme}://{urlparse(url).netloc}"
+    if base_url:
+        provider_name = parse_url(base_url).netloc
+    else:
+        base_url = f"{parsed_url.scheme}://{domain}"
+        provider_name = domain
 
-    if is_pdf(url):
-        file_path = await download_pdf(session, url)
+    if await is_pdf(session, url):
+        file_path = await download_pdf(session, url, ctx)
         if file_path:
-            verification_status = verify_pdf(
-                file_path, cas, name)  # check the verification status
-            provider_name = base_url.split("/")[2]  # get the provider name
+            # PyMuPDF is blocking, verify off the event loop
+            loop = asyncio.get_running_loop()
+            verification_status = await loop.run_in_executor(
+                PDF_EXECUTOR, verify_pdf, file_path, ctx.target_pattern,
+                ctx.name_tokens_pattern)  # check the verification status
             if verification_status == "same":
                 print(
                     f"Verification status: {file_path} is probably the required MSDS"
                 )
                 new_file_path = rename_and_move_file(file_path, PDFS_FOLDER,
-                                                     cas, name, provider_name)
+                                                     ctx.cas, ctx.name,
+                                                     provider_name)
                 if new_file_path:
-                    add_report(REPORT_LIST, cas, name, new_file_path, True,
-                               provider_name, url)
+                    add_report(ctx, new_file_path, True, provider_name, url)
 
             elif verification_status == "similar":
                 print(
                     f"Verification status: {file_path} may be the required MSDS"
                 )
-                add_report(REPORT_LIST, cas, name, file_path, False,
-                           provider_name, url)
+                add_report(ctx, file_path, False, provider_name, url)
 
             else:
                 print(f"Verification status: {file_path} is not a MSDS")
                 # Delete unnecessary files
                 os.remove(file_path)
-    else:
+    elif depth > 1:
+        # Queue the links of the page for the next level
         links = await scrape_urls(session, url, base_url)
         for link in links:
-            params = {
-                "downloaded_files_count": DOWNLOADED_FILES_COUNT,
-                "download_limit": DOWNLOAD_LIMIT,
-                "url_visit_count": URL_VISIT_COUNT,
-                "domain_visit_count": DOMAIN_VISIT_COUNT,
-                "max_url_visits": MAX_URL_VISITS,
-                "max_domain_visits": MAX_DOMAIN_VISITS,
-                "report_list": REPORT_LIST
-            }
-            await find_pdfs(session, link, depth - 1, base_url, cas, name,
-                            params)
+            queue.put_nowait((link, ctx, depth - 1, base_url))
+
+
+# Crawl worker
+async def crawl_worker(session, queue):
+    """
+    Process queued URLs with find_pdfs until cancelled.
+
+    Params:
+        queue (asyncio.Queue): The crawl frontier of (url, ctx, depth, base_url) items.
+    """
+    while True:
+        url, ctx, depth, base_url = await queue.get()
+        try:
+            await find_pdfs(session, queue, url, ctx, depth, base_url)
+        except Exception as e:
+            print(f"An error occurred while crawling {url}: {e}")
+        finally:
+            queue.task_done()
 
 
 # Search Google for MSDS
-async def scout(cas, name, max_search_results=10):
+async def scout(cas,
+                name,
+                max_search_results=10,
+                concurrency=CONCURRENCY_LIMIT):
     """
     Search for Material Safety Data Sheets (MSDS) using Google and process the results.
 
     Params:
         cas_or_name (str): The CAS number or element name to search for.
         max_search_results (int, optional): The maximum number of search results to process. Defaults to 10.
+        concurrency (int, optional): The number of crawl workers. Defaults to CONCURRENCY_LIMIT.
     """
 
     if cas is None and name is None:
@@ -530,35 +744,67 @@ async def scout(cas, name, max_search_results=10):
     # Report list :
     report_list = []
 
+    # Compile the verification patterns once for the whole crawl
+    target_pattern = set_pattern(cas or name)
+    name_tokens_pattern = None
+    if name is not None:
+        name_tokens_pattern = re.compile(
+            '|'.join(map(re.escape, name.split())), re.IGNORECASE)
+
     query = f"download msds of {cas or name}"
     print(f"Searching Google for: {query}")
-    search_results = search(query,
-                            num=max_search_results,
-                            stop=max_search_results)
-    async with aiohttp.ClientSession() as session:
-        for result in search_results:
-            print(f"Google search result: {result}")
-            try:
-                # create params
-                config_params = {
-                    "report_list": report_list,
-                    "url_visit_count": {},
-                    "domain_visit_count": {},
-                    "max_url_visits": 5,
-                    "max_domain_visits": 10,
-                    "download_limit": 5,
-                    "downloaded_files_count": 0,
-                }
-
-                await find_pdfs(session,
-                                result,
-                                depth=2,
-                                base_url=None,
-                                cas=cas,
-                                name=name,
-                                config_params=config_params)
-            except Exception as e:
-                print(f"An error occurred while searching {result}: {e}")
+    # googlesearch is blocking, run it off the event loop
+    search_results = await asyncio.to_thread(
+        lambda: list(
+            search(query, num=max_search_results, stop=max_search_results)))
+    # Reuse connections and cache DNS lookups across the whole crawl
+    connector = aiohttp.TCPConnector(limit=200,
+                                     limit_per_host=8,
+                                     ttl_dns_cache=300,
+                                     keepalive_timeout=30,
+                                     enable_cleanup_closed=True)
+    async with aiohttp.ClientSession(
+            connector=connector,
+            headers={"User-Agent": "scout/1"},
+            timeout=aiohttp.ClientTimeout(total=20)) as session:
+        # Log report entries from a single writer as they are found
+        report_queue = asyncio.Queue()
+        writer = asyncio.create_task(report_writer(report_queue))
+
+        workers = []
+        try:
+            # Crawl breadth first from every search result
+            queue = asyncio.Queue()
+            seen_urls = set()
+            download_semaphore = get_download_semaphore()
+            for result in search_results:
+                print(f"Google search result: {result}")
+                # create crawl state
+                ctx = CrawlCtx(report_list=report_list,
+                               report_queue=report_queue,
+                               download_semaphore=download_semaphore,
+                               target_pattern=target_pattern,
+                               cas=cas,
+                               name=name,
+                               name_tokens_pattern=name_tokens_pattern,
+                               seen_urls=seen_urls,
+                               max_domain_visits=10,
+                               download_limit=5)
+                queue.put_nowait((result, ctx, 2, None))
+
+            workers = [
+                asyncio.create_task(crawl_worker(session, queue))
+                for _ in range(concurrency)
+            ]
+            await queue.join()
+        finally:
+            # Stop the workers and flush the reports log on every path
+            for worker in workers:
+                worker.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+
+            report_queue.put_nowait(None)
+            await writer
     report_in_json = save_report(report_list)
     return report_in_json
 